@@ -4,6 +4,7 @@ import os
 import argparse
 from collections import Counter
 import tarfile
+import multiprocessing as mp
 
 import numpy as np
 import itertools
@@ -15,7 +16,10 @@ from smact.screening import pauling_test
 from pymatgen.core import Structure
 from pymatgen.analysis.structure_matcher import StructureMatcher
 
-from crystallm import is_sensible
+from crystallm import (
+    array_split,
+    is_sensible,
+)
 
 import warnings
 warnings.filterwarnings("ignore")
@@ -86,9 +90,16 @@ def is_valid(struct):
     return comp_valid and struct_valid
 
 
-# adapted from
-#  https://github.com/jiaor17/DiffCSP/blob/ee131b03a1c6211828e8054d837caa8f1a980c3e/scripts/compute_metrics.py
-def get_match_rate_and_rms(gen_structs, true_structs, matcher):
+def progress_listener(queue, n):
+    pbar = tqdm(total=n, desc="comparing structures...")
+    while True:
+        message = queue.get()
+        if message == "kill":
+            break
+        pbar.update(message)
+
+
+def get_rms_dists(chunk_of_structs, matcher, queue=None):
     def process_one(pred, gt, is_pred_valid):
         if not is_pred_valid:
             return None
@@ -100,12 +111,16 @@ def get_match_rate_and_rms(gen_structs, true_structs, matcher):
             return None
 
     rms_dists = []
-    for i in tqdm(range(len(gen_structs)), desc="comparing structures..."):
+    for gen_structs, true_struct in tqdm(chunk_of_structs, disable=queue is not None, desc="comparing structures..."):
         tmp_rms_dists = []
-        for j in range(len(gen_structs[i])):
+        for gen_struct in gen_structs:
             try:
-                struct_valid = is_valid(gen_structs[i][j])
-                rmsd = process_one(gen_structs[i][j], true_structs[i], struct_valid)
+                if gen_struct.composition.reduced_formula != true_struct.composition.reduced_formula:
+                    # structures with different compositions can never match,
+                    #  so skip the validity check and the costly structure matching
+                    continue
+                struct_valid = is_valid(gen_struct)
+                rmsd = process_one(gen_struct, true_struct, struct_valid)
                 if rmsd is not None:
                     tmp_rms_dists.append(rmsd)
             except Exception:
@@ -114,6 +129,40 @@ def get_match_rate_and_rms(gen_structs, true_structs, matcher):
             rms_dists.append(None)
         else:
             rms_dists.append(np.min(tmp_rms_dists))
+        if queue:
+            queue.put(1)
+    return rms_dists
+
+
+# adapted from
+#  https://github.com/jiaor17/DiffCSP/blob/ee131b03a1c6211828e8054d837caa8f1a980c3e/scripts/compute_metrics.py
+def get_match_rate_and_rms(gen_structs, true_structs, matcher, workers=1):
+    structs = list(zip(gen_structs, true_structs))
+
+    if workers > 1:
+        # the comparisons are independent of each other, so they can be distributed across
+        #  the workers; the chunks are contiguous, so the original order is preserved
+        chunks = array_split(structs, workers)
+        manager = mp.Manager()
+        queue = manager.Queue()
+        pool = mp.Pool(workers + 1)  # add an extra worker for the watcher
+        watcher = pool.apply_async(progress_listener, (queue, len(structs),))
+
+        jobs = []
+        for i in range(workers):
+            chunk = chunks[i]
+            job = pool.apply_async(get_rms_dists, (chunk, matcher, queue))
+            jobs.append(job)
+
+        rms_dists = []
+        for job in jobs:
+            rms_dists.extend(job.get())
+
+        queue.put("kill")
+        pool.close()
+        pool.join()
+    else:
+        rms_dists = get_rms_dists(structs, matcher)
 
     rms_dists = np.array(rms_dists)
     match_rate = sum(rms_dists != None) / len(gen_structs)
@@ -139,16 +188,19 @@ def extract_cif_id(filepath):
         raise ValueError(f"'{filename}' does not conform to expected format 'id__n.cif'")
 
 
-def read_generated_cifs(input_path):
+def read_generated_cifs(input_path, n_gens=None):
     generated_cifs = {}
     with tarfile.open(input_path, "r:gz") as tar:
-        for member in tqdm(tar.getmembers(), desc="extracting generated CIFs..."):
-            f = tar.extractfile(member)
-            if f is not None:
-                cif = f.read().decode("utf-8")
+        for member in tqdm(tar, desc="extracting generated CIFs..."):
+            # skip directories and any other non-CIF entries before doing any work on them
+            if member.isfile() and member.name.endswith(".cif"):
                 cif_id = extract_cif_id(member.name)
                 if cif_id not in generated_cifs:
                     generated_cifs[cif_id] = []
+                if n_gens is not None and len(generated_cifs[cif_id]) >= n_gens:
+                    # only the first n_gens generations are used, so don't bother reading the rest
+                    continue
+                cif = tar.extractfile(member).read().decode("utf-8")
                 generated_cifs[cif_id].append(cif)
     return generated_cifs
 
@@ -156,10 +208,9 @@ def read_generated_cifs(input_path):
 def read_true_cifs(input_path):
     true_cifs = {}
     with tarfile.open(input_path, "r:gz") as tar:
-        for member in tqdm(tar.getmembers(), desc="extracting true CIFs..."):
-            f = tar.extractfile(member)
-            if f is not None:
-                cif = f.read().decode("utf-8")
+        for member in tqdm(tar, desc="extracting true CIFs..."):
+            if member.isfile() and member.name.endswith(".cif"):
+                cif = tar.extractfile(member).read().decode("utf-8")
                 filename = os.path.basename(member.name)
                 cif_id = filename.replace(".cif", "")
                 true_cifs[cif_id] = cif
@@ -208,6 +259,8 @@ if __name__ == "__main__":
                         help="The smallest cell angle allowable for the sensibility check")
     parser.add_argument("--angle_hi", required=False, default=170., type=float,
                         help="The largest cell angle allowable for the sensibility check")
+    parser.add_argument("--workers", required=False, default=1, type=int,
+                        help="The number of workers to use for comparing structures. Default is 1.")
     args = parser.parse_args()
 
     gen_cifs_path = args.gen_cifs
@@ -217,6 +270,7 @@ if __name__ == "__main__":
     length_hi = args.length_hi
     angle_lo = args.angle_lo
     angle_hi = args.angle_hi
+    workers = args.workers
 
     if n_gens == 0:
         n_gens = None
@@ -229,13 +283,13 @@ if __name__ == "__main__":
     # defaults taken from DiffCSP
     struct_matcher = StructureMatcher(stol=0.5, angle_tol=10, ltol=0.3)
 
-    id_to_gen_cifs = read_generated_cifs(gen_cifs_path)
+    id_to_gen_cifs = read_generated_cifs(gen_cifs_path, n_gens)
     id_to_true_cifs = read_true_cifs(true_cifs_path)
 
     gen_structs, true_structs = get_structs(
         id_to_gen_cifs, id_to_true_cifs, n_gens, length_lo, length_hi, angle_lo, angle_hi
     )
 
-    metrics = get_match_rate_and_rms(gen_structs, true_structs, struct_matcher)
+    metrics = get_match_rate_and_rms(gen_structs, true_structs, struct_matcher, workers)
 
     print(metrics)
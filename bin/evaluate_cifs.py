@@ -9,18 +9,21 @@ from tqdm import tqdm
 import numpy as np
 import pandas as pd
 
+from pymatgen.core import Composition
+
 from crystallm import (
     CIFTokenizer,
     bond_length_reasonableness_score,
     extract_data_formula,
+    extract_formula_nonreduced,
     extract_numeric_property,
     extract_space_group_symbol,
     extract_volume,
     get_unit_cell_volume,
     is_atom_site_multiplicity_consistent,
+    is_formula_consistent,
     is_space_group_consistent,
     is_sensible,
-    is_valid,
     replace_symmetry_operators,
 )
 
@@ -31,10 +34,9 @@ warnings.filterwarnings("ignore")
 def read_generated_cifs(input_path):
     generated_cifs = []
     with tarfile.open(input_path, "r:gz") as tar:
-        for member in tqdm(tar.getmembers(), desc="extracting generated CIFs..."):
-            f = tar.extractfile(member)
-            if f is not None:
-                cif = f.read().decode("utf-8")
+        for member in tqdm(tar, desc="extracting generated CIFs..."):
+            if member.isfile() and member.name.endswith(".cif"):
+                cif = tar.extractfile(member).read().decode("utf-8")
                 generated_cifs.append(cif)
     return generated_cifs
 
@@ -50,10 +52,11 @@ def progress_listener(queue, n):
             break
 
 
-def eval_cif(progress_queue, task_queue, result_queue, length_lo, length_hi, angle_lo, angle_hi, debug):
+def eval_cif(progress_queue, task_queue, result_queue, length_lo, length_hi, angle_lo, angle_hi, max_sites, debug):
     tokenizer = CIFTokenizer()
     n_atom_site_multiplicity_consistent = 0
     n_space_group_consistent = 0
+    n_skipped = 0
     bond_length_reasonableness_scores = []
     is_valid_and_len = []
 
@@ -67,16 +70,25 @@ def eval_cif(progress_queue, task_queue, result_queue, length_lo, length_hi, ang
             if not is_sensible(cif, length_lo, length_hi, angle_lo, angle_hi):
                 raise Exception("CIF not sensible")
 
+            # the cost of the checks below grows with the number of sites, so large cells can optionally be
+            #  skipped; the number of sites is obtained cheaply from the formula, without parsing the structure
+            if max_sites > 0 and Composition(extract_formula_nonreduced(cif)).num_atoms > max_sites:
+                n_skipped += 1
+                progress_queue.put(1)
+                continue
+
             gen_len = len(tokenizer.tokenize_cif(cif))
 
             space_group_symbol = extract_space_group_symbol(cif)
             if space_group_symbol is not None and space_group_symbol != "P 1":
                 cif = replace_symmetry_operators(cif, space_group_symbol)
 
-            if is_atom_site_multiplicity_consistent(cif):
+            atom_site_multiplicity_consistent = is_atom_site_multiplicity_consistent(cif)
+            if atom_site_multiplicity_consistent:
                 n_atom_site_multiplicity_consistent += 1
 
-            if is_space_group_consistent(cif):
+            space_group_consistent = is_space_group_consistent(cif)
+            if space_group_consistent:
                 n_space_group_consistent += 1
 
             score = bond_length_reasonableness_score(cif)
@@ -93,7 +105,9 @@ def eval_cif(progress_queue, task_queue, result_queue, length_lo, length_hi, ang
             gen_vol = extract_volume(cif)
             data_formula = extract_data_formula(cif)
 
-            valid = is_valid(cif, bond_length_acceptability_cutoff=1.0)
+            # re-use the checks performed above, rather than calling is_valid(), which would repeat them
+            valid = is_formula_consistent(cif) and atom_site_multiplicity_consistent and \
+                score >= 1.0 and space_group_consistent
 
             is_valid_and_len.append((data_formula, space_group_symbol, valid, gen_len, implied_vol, gen_vol))
 
@@ -106,6 +120,7 @@ def eval_cif(progress_queue, task_queue, result_queue, length_lo, length_hi, ang
     result = (
         n_atom_site_multiplicity_consistent,
         n_space_group_consistent,
+        n_skipped,
         bond_length_reasonableness_scores,
         is_valid_and_len,
     )
@@ -127,6 +142,10 @@ if __name__ == "__main__":
                         help="The smallest cell angle allowable for the sensibility check")
     parser.add_argument("--angle_hi", required=False, default=170., type=float,
                         help="The largest cell angle allowable for the sensibility check")
+    parser.add_argument("--max-sites", required=False, default=0, type=int,
+                        help="The maximum number of sites in the unit cell; CIFs whose cell has more sites are "
+                             "skipped, reported separately, and excluded from the other counts and the .csv. "
+                             "Default is 0, which means there is no limit.")
     parser.add_argument("--workers", type=int, default=2,
                         help="Number of workers to use for processing.")
     parser.add_argument("--debug", required=False, action="store_true",
@@ -139,6 +158,7 @@ if __name__ == "__main__":
     length_hi = args.length_hi
     angle_lo = args.angle_lo
     angle_hi = args.angle_hi
+    max_sites = args.max_sites
     workers = args.workers
     debug = args.debug
 
@@ -158,7 +178,7 @@ if __name__ == "__main__":
     processes = [
         mp.Process(
             target=eval_cif,
-            args=(progress_queue, task_queue, result_queue, length_lo, length_hi, angle_lo, angle_hi, debug)
+            args=(progress_queue, task_queue, result_queue, length_lo, length_hi, angle_lo, angle_hi, max_sites, debug)
         ) for _ in range(workers)
     ]
     processes.append(watcher)
@@ -171,46 +191,46 @@ if __name__ == "__main__":
 
     n_atom_site_multiplicity_consistent = 0
     n_space_group_consistent = 0
+    n_skipped = 0
     bond_length_reasonableness_scores = []
     is_valid_and_lens = []
 
     while not result_queue.empty():
-        n_atom_site_occ, n_space_group, scores, is_valid_and_len = result_queue.get()
+        n_atom_site_occ, n_space_group, n_skip, scores, is_valid_and_len = result_queue.get()
         n_atom_site_multiplicity_consistent += n_atom_site_occ
         n_space_group_consistent += n_space_group
+        n_skipped += n_skip
         bond_length_reasonableness_scores.extend(scores)
         is_valid_and_lens.extend(is_valid_and_len)
 
     n_valid = 0
     valid_gen_lens = []
-    results_data = {
-        "comp": [],
-        "sg": [],
-        "is_valid": [],
-        "gen_len": [],
-        "implied_vol": [],
-        "gen_vol": [],
-    }
-    for comp, sg, valid, gen_len, implied_vol, gen_vol in is_valid_and_lens:
+    for _, _, valid, gen_len, _, _ in is_valid_and_lens:
         if valid:
             n_valid += 1
             valid_gen_lens.append(gen_len)
-        results_data["comp"].append(comp)
-        results_data["sg"].append(sg)
-        results_data["is_valid"].append(valid)
-        results_data["gen_len"].append(gen_len)
-        results_data["implied_vol"].append(implied_vol)
-        results_data["gen_vol"].append(gen_vol)
-
-    print(f"space group consistent: {n_space_group_consistent}/{n} ({n_space_group_consistent / n:.3f})\n"
-          f"atom site multiplicity consistent: "
-          f"{n_atom_site_multiplicity_consistent}/{n} ({n_atom_site_multiplicity_consistent / n:.3f})\n"
-          f"avg. bond length reasonableness score: "
-          f"{np.mean(bond_length_reasonableness_scores):.4f} ± {np.std(bond_length_reasonableness_scores):.4f}\n"
-          f"bond lengths reasonable: "
-          f"{bond_length_reasonableness_scores.count(1.)}/{n} ({bond_length_reasonableness_scores.count(1.) / n:.3f})")
-    print(f"num valid: {n_valid}/{n} ({n_valid / n:.2f})")
-    print(f"longest valid generated length: {np.max(valid_gen_lens) if len(valid_gen_lens) > 0 else np.nan:,}")
-    print(f"avg. valid generated length: {np.mean(valid_gen_lens):.3f} ± {np.std(valid_gen_lens):.3f}")
-
-    pd.DataFrame(results_data).to_csv(out_fname)
+
+    if max_sites > 0:
+        print(f"skipped (> {max_sites} sites): {n_skipped}/{n} ({n_skipped / n:.3f})")
+
+    # the skipped CIFs were not evaluated, so they are excluded from the counts below
+    n_evaluated = n - n_skipped
+
+    if n_evaluated > 0:
+        print(f"space group consistent: "
+              f"{n_space_group_consistent}/{n_evaluated} ({n_space_group_consistent / n_evaluated:.3f})\n"
+              f"atom site multiplicity consistent: "
+              f"{n_atom_site_multiplicity_consistent}/{n_evaluated} "
+              f"({n_atom_site_multiplicity_consistent / n_evaluated:.3f})\n"
+              f"avg. bond length reasonableness score: "
+              f"{np.mean(bond_length_reasonableness_scores):.4f} ± {np.std(bond_length_reasonableness_scores):.4f}\n"
+              f"bond lengths reasonable: "
+              f"{bond_length_reasonableness_scores.count(1.)}/{n_evaluated} "
+              f"({bond_length_reasonableness_scores.count(1.) / n_evaluated:.3f})")
+        print(f"num valid: {n_valid}/{n_evaluated} ({n_valid / n_evaluated:.2f})")
+        print(f"longest valid generated length: {np.max(valid_gen_lens) if len(valid_gen_lens) > 0 else np.nan:,}")
+        print(f"avg. valid generated length: {np.mean(valid_gen_lens):.3f} ± {np.std(valid_gen_lens):.3f}")
+
+    # build the results directly from the rows, rather than from a column-wise copy of them
+    results_columns = ["comp", "sg", "is_valid", "gen_len", "implied_vol", "gen_vol"]
+    pd.DataFrame(is_valid_and_lens, columns=results_columns).to_csv(out_fname)
@@ -4,6 +4,8 @@ import os
 import argparse
 import tarfile
 import pickle
+import numpy as np
+import pandas as pd
 import torch
 
 from pymatgen.core import Element
@@ -17,7 +19,7 @@ from crystallm import (
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract learned embeddings.")
-    parser.add_argument("name", type=str, required=True,
+    parser.add_argument("name", type=str,
                         help="Path to the folder containing the model checkpoint file.")
     parser.add_argument("--dataset", type=str, required=True,
                         help="Path to the tokenized dataset file (.tar.gz).")
@@ -65,27 +67,16 @@ if __name__ == "__main__":
     sorted_elems = sorted([(e, Element(e).number) for e in tokenizer.atoms()], key=lambda v: v[1])
     dim = embedding_weights.shape[1]
 
-    with open(out_fname, "wt") as f:
-        header = ["element"]
-        header.extend([str(i) for i in range(dim)])
-        f.write("%s\n" % ",".join(header))
-        if embedding_type == "atom":
-            for elem, _ in sorted_elems:
-                vec = embedding_weights[stoi[elem]].tolist()
-                row = [elem]
-                row.extend([str(v) for v in vec])
-                f.write("%s\n" % ",".join(row))
-        elif embedding_type == "digit":
-            for i in range(10):
-                digit = str(i)
-                vec = embedding_weights[stoi[digit]].tolist()
-                row = [digit]
-                row.extend([str(v) for v in vec])
-                f.write("%s\n" % ",".join(row))
-        elif embedding_type == "spacegroup":
-            for sg in tokenizer.space_groups():
-                spacegroup = f"{sg}_sg"
-                vec = embedding_weights[stoi[spacegroup]].tolist()
-                row = [spacegroup]
-                row.extend([str(v) for v in vec])
-                f.write("%s\n" % ",".join(row))
+    if embedding_type == "atom":
+        tokens = [elem for elem, _ in sorted_elems]
+    elif embedding_type == "digit":
+        tokens = [str(i) for i in range(10)]
+    else:
+        tokens = [f"{sg}_sg" for sg in tokenizer.space_groups()]
+
+    # select all the vectors at once, and let pandas format the rows, rather than
+    #  converting and joining each value in Python; float64 preserves the previous output
+    vecs = embedding_weights[[stoi[token] for token in tokens]].detach().numpy().astype(np.float64)
+    df = pd.DataFrame(vecs, columns=[str(i) for i in range(dim)])
+    df.insert(0, "element", tokens)
+    df.to_csv(out_fname, index=False)
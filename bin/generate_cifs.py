@@ -133,10 +133,9 @@ if __name__ == "__main__":
 
     prompts = []
     with tarfile.open(prompts_file, "r:gz") as tar:
-        for member in tqdm(tar.getmembers(), desc="extracting prompts..."):
-            f = tar.extractfile(member)
-            if f is not None:
-                content = f.read().decode("utf-8")
+        for member in tqdm(tar, desc="extracting prompts..."):
+            if member.isfile() and member.name.endswith(".txt"):
+                content = tar.extractfile(member).read().decode("utf-8")
                 filename = os.path.basename(member.name)
                 cif_id = filename.replace(".txt", "")
                 prompts.append((cif_id, content))
@@ -57,31 +57,37 @@ if __name__ == "__main__":
     if underrepresented_fname:
         underrepresented_set = get_underrepresented_set(underrepresented_fname)
 
-    all_cif_start_indices = []
-    underrepresented_start_indices = []
+    stoi = meta["stoi"]
+    itos = meta["itos"]
 
-    curr_cif_tokens = []
+    # locate the start of each CIF with a single vectorized scan over the token IDs
+    cif_start_indices = np.flatnonzero(train_ids == stoi["data_"])
+    all_cif_start_indices = cif_start_indices.tolist()
 
-    for i, id in tqdm(enumerate(train_ids), total=len(train_ids), desc="identifying starts..."):
-        token = meta["itos"][id]
+    underrepresented_start_indices = []
 
-        if token == "data_":
-            all_cif_start_indices.append(i)
+    if underrepresented_set:
+        # a sequence of two newlines indicates the end of a CIF
+        is_newline = train_ids == stoi["\n"]
+        cif_end_indices = np.flatnonzero(is_newline[1:] & is_newline[:-1]) + 1
 
-        curr_cif_tokens.append(token)
+        cif_start = 0
+        for cif_end in tqdm(cif_end_indices, desc="identifying underrepresented starts..."):
+            if cif_end - 1 < cif_start:
+                # the newline pair straddles the end of the previous CIF
+                continue
 
-        if len(curr_cif_tokens) > 1 and curr_cif_tokens[-2:] == ['\n', '\n']:
-            # we're at the end of the CIF;
-            #  reconstruct the CIF and see if it's in the underrepresented set
-            cif = ''.join(curr_cif_tokens)
+            # reconstruct the CIF and see if it's in the underrepresented set
+            cif = "".join(itos[id] for id in train_ids[cif_start:cif_end + 1])
             data_formula = extract_data_formula(cif)
             space_group_symbol = extract_space_group_symbol(cif)
 
-            if underrepresented_set and f"{data_formula}_{space_group_symbol}" in underrepresented_set:
-                # the last added start index is the start index of this CIF
-                underrepresented_start_indices.append(all_cif_start_indices[-1])
+            if f"{data_formula}_{space_group_symbol}" in underrepresented_set:
+                # the last start index before the end of the CIF is the start index of this CIF
+                last_start = np.searchsorted(cif_start_indices, cif_end, side="right") - 1
+                underrepresented_start_indices.append(int(cif_start_indices[last_start]))
 
-            curr_cif_tokens = []
+            cif_start = cif_end + 1
 
     print("writing start indices...")
     with open(out_fname, "wb") as f:
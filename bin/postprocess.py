@@ -44,7 +44,7 @@ if __name__ == "__main__":
 
     if input_path.endswith(".tar.gz"):
         with tarfile.open(input_path, "r:gz") as tar, tarfile.open(output_path, "w:gz") as out_tar:
-            for member in tar.getmembers():
+            for member in tar:
                 if member.isfile() and member.name.endswith(".cif"):
                     file = tar.extractfile(member)
                     cif_str = file.read().decode()
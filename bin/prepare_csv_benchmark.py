@@ -10,11 +10,12 @@ warnings.filterwarnings("ignore")
 
 
 def process_cif_files(input_csv, output_tar_gz):
-    df = pd.read_csv(input_csv)
+    # only the ID and CIF columns are needed, so don't parse the property columns
+    df = pd.read_csv(input_csv, usecols=["material_id", "cif"])
     with tarfile.open(output_tar_gz, "w:gz") as tar:
-        for _, row in tqdm(df.iterrows(), total=len(df), desc="preparing CIF files..."):
-            id = row["material_id"]
-            struct = Structure.from_str(row["cif"], fmt="cif")
+        # iterate over the columns directly, as iterrows() constructs a Series for every row
+        for id, cif in tqdm(zip(df["material_id"], df["cif"]), total=len(df), desc="preparing CIF files..."):
+            struct = Structure.from_str(cif, fmt="cif")
             cif_content = CifWriter(struct=struct, symprec=0.1).__str__()
 
             cif_file = tarfile.TarInfo(name=f"{id}.cif")
@@ -10,10 +10,9 @@ def load_data_from_tar(tar_gz_filename):
     print(f"loading data from {tar_gz_filename}...")
     cif_data = []
     with tarfile.open(tar_gz_filename, "r:gz") as tar:
-        for member in tqdm(tar.getmembers(), desc="extracting files..."):
-            f = tar.extractfile(member)
-            if f is not None:
-                content = f.read().decode("utf-8")
+        for member in tqdm(tar, desc="extracting files..."):
+            if member.isfile() and member.name.endswith(".cif"):
+                content = tar.extractfile(member).read().decode("utf-8")
                 filename = os.path.basename(member.name)
                 cif_id = filename.replace(".cif", "")
                 cif_data.append((cif_id, content))
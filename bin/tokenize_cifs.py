@@ -38,6 +38,16 @@ def tokenize(chunk_of_cifs, queue=None):
     return tokenized
 
 
+def print_tokenized_stats(split, tokenized_cifs):
+    lens = [len(t) for t in tokenized_cifs]
+    unk_counts = [t.count("<unk>") for t in tokenized_cifs]
+    # print the stats as a single block, rather than with a separate print() per line
+    print(f"{split} min tokenized length: {np.min(lens):,}\n"
+          f"{split} max tokenized length: {np.max(lens):,}\n"
+          f"{split} mean tokenized length: {np.mean(lens):.2f} +/- {np.std(lens):.2f}\n"
+          f"{split} total unk counts: {np.sum(unk_counts)}")
+
+
 def preprocess(cifs_raw):
     cifs = []
     for _, cif in tqdm(cifs_raw, desc="preparing files..."):
@@ -116,23 +126,13 @@ if __name__ == "__main__":
     pool.close()
     pool.join()
 
-    lens = [len(t) for t in tokenized_cifs_train]
-    unk_counts = [t.count("<unk>") for t in tokenized_cifs_train]
-    print(f"train min tokenized length: {np.min(lens):,}")
-    print(f"train max tokenized length: {np.max(lens):,}")
-    print(f"train mean tokenized length: {np.mean(lens):.2f} +/- {np.std(lens):.2f}")
-    print(f"train total unk counts: {np.sum(unk_counts)}")
+    print_tokenized_stats("train", tokenized_cifs_train)
 
     if has_val:
         # tokenize the validation CIFs
         tokenized_cifs_val = tokenize(cifs_val)
 
-        lens = [len(t) for t in tokenized_cifs_val]
-        unk_counts = [t.count("<unk>") for t in tokenized_cifs_val]
-        print(f"val min tokenized length: {np.min(lens):,}")
-        print(f"val max tokenized length: {np.max(lens):,}")
-        print(f"val mean tokenized length: {np.mean(lens):.2f} +/- {np.std(lens):.2f}")
-        print(f"val total unk counts: {np.sum(unk_counts)}")
+        print_tokenized_stats("val", tokenized_cifs_val)
 
     # create a single stream of tokens that will be the dataset
     train_data = []
@@ -146,8 +146,11 @@ if __name__ == "__main__":
         elif cif_start_indices_val is not None:
             ix = cif_start_indices_val[torch.randperm(len(cif_start_indices_val))[:C.batch_size]]
 
-        x = torch.stack([torch.from_numpy((data[i:i + C.block_size]).astype(np.int64)) for i in ix])
-        y = torch.stack([torch.from_numpy((data[i + 1:i + 1 + C.block_size]).astype(np.int64)) for i in ix])
+        # read all the sequences in one fancy-indexing gather, rather than slicing each one separately;
+        #  each row holds block_size + 1 tokens, so that the targets are the inputs shifted by one
+        seqs = torch.from_numpy(data[ix.numpy()[:, None] + np.arange(C.block_size + 1)].astype(np.int64))
+        x = seqs[:, :-1].contiguous()
+        y = seqs[:, 1:].contiguous()
 
         if device_type == "cuda":
             # pin arrays x,y, which allows us to move them to GPU asynchronously (non_blocking=True)
@@ -34,6 +34,9 @@ class MCTSEvaluator:
         self._bond_length_acceptability_cutoff = bond_length_acceptability_cutoff
         self._k = reward_k
         self._out_dir = out_dir
+        if self._out_dir is not None:
+            # create the output directory up front, rather than checking for it on every write
+            os.makedirs(self._out_dir, exist_ok=True)
         self._num_valid = 0
         self._all_scores = []
         self._all_cifs = []
@@ -101,31 +104,26 @@ class MCTSEvaluator:
 
     def _write_cif_to_file(self, cif, score, reward, id, iter_num):
         if self._out_dir is not None:
-
-            if not os.path.exists(self._out_dir):
-                os.makedirs(self._out_dir)
-
             cif_file = f"generated_{id}.cif"
             cif_fname = os.path.join(self._out_dir, cif_file)
-            if not os.path.exists(cif_fname):
-                print(f"writing CIF to: {cif_fname}")
-                with open(cif_fname, "wt") as f:
+            try:
+                # exclusive creation fails if the file already exists, so there's no need to check for it first
+                with open(cif_fname, "xt") as f:
+                    print(f"writing CIF to: {cif_fname}")
                     f.write(cif)
-
-                # create .csv to keep track of results
-                csv_file = "results.csv"
-                csv_fname = os.path.join(self._out_dir, csv_file)
-                if not os.path.exists(csv_fname):
-                    print(f"creating {csv_fname} as it does not exist...")
-                    with open(csv_fname, "wt") as f:
-                        f.write("file,iteration,score,reward\n")
-
-                # update .csv
-                with open(csv_fname, "a") as f:
-                    f.write(f"{cif_file},{iter_num},{score},{reward}\n")
-
-            else:
+            except FileExistsError:
                 print(f"CIF not written to file as it already exists: {cif_fname}")
+                return
+
+            # update the .csv that keeps track of results
+            csv_file = "results.csv"
+            csv_fname = os.path.join(self._out_dir, csv_file)
+            with open(csv_fname, "a") as f:
+                # an append-mode file is positioned at its end, so it's new (or empty) if we're at 0
+                if f.tell() == 0:
+                    print(f"creating {csv_fname} as it does not exist...")
+                    f.write("file,iteration,score,reward\n")
+                f.write(f"{cif_file},{iter_num},{score},{reward}\n")
 
     def __call__(self, token_sequence, iter_num):
         cif = self._tokenizer.decode(token_sequence)
@@ -247,6 +245,11 @@ class ContextSensitiveTreeBuilder:
         self._top_child_weight_cutoff = top_child_weight_cutoff
         self._n_space_groups = n_space_groups
         self._bypass_only_child = bypass_only_child
+        # the token IDs that precede the space group; looked up once, as they're checked at every node
+        self._space_group_prefix = [
+            self._tok.token_to_id["_symmetry_space_group_name_H-M"],
+            self._tok.token_to_id[" "],
+        ]
 
     def get_child_ids_and_weights(
         self,
@@ -258,7 +261,7 @@ class ContextSensitiveTreeBuilder:
         newline_id: int,
     ) -> Tuple[Union[List[int], List[List[int]]], List[float]]:
 
-        if len(state) > 1 and state[-2:] == [self._tok.token_to_id["_symmetry_space_group_name_H-M"], self._tok.token_to_id[" "]] and self._n_space_groups > 0:
+        if self._n_space_groups > 0 and state[-2:] == self._space_group_prefix:
             return lm.top_n_vocab_with_weights(self._n_space_groups, state)
 
         top_child_id = top_n_child_ids[0]
@@ -340,7 +343,13 @@ class MCTSNode:
                          parent=self, tree_builder=self.tree_builder)
         child.prob = self.child_weight_map[tuple(child_state)]
         self.children.append(child)
-        self.untried_moves.remove(child_state)
+        # the move usually comes from select_untried_move(), so look for it by identity first, as
+        #  list.remove() would compare the sibling token sequences (which share a long prefix) element-wise
+        index = next((i for i, move in enumerate(self.untried_moves) if move is child_state), None)
+        if index is not None:
+            del self.untried_moves[index]
+        else:
+            self.untried_moves.remove(child_state)
         return child
 
     def has_children(self):
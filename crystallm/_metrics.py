@@ -1,18 +1,41 @@
 import re
+from functools import lru_cache
 
 from pymatgen.analysis.local_env import CrystalNN
-from pymatgen.core import Composition, Structure
+from pymatgen.core import Composition
 from pymatgen.io.cif import CifParser
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 
 from ._utils import extract_data_formula
 
 
+# the checks below are typically applied one after another to the same CIF, so the
+#  parsed results are memoized; the cache is kept small, as only recent CIFs are re-used
+@lru_cache(maxsize=128)
+def _get_cif_parser(cif_str):
+    return CifParser.from_string(cif_str)
+
+
+@lru_cache(maxsize=128)
+def _parse_structure(cif_str):
+    # equivalent to Structure.from_str(cif_str, fmt="cif"), but re-uses the parser
+    #  that the CIF data is obtained from, instead of parsing the CIF again
+    return _get_cif_parser(cif_str).get_structures(primitive=False)[0]
+
+
+def _parse_cif_data(cif_str):
+    return _get_cif_parser(cif_str).as_dict()
+
+
 def bond_length_reasonableness_score(cif_str, tolerance=0.32, h_factor=2.5):
     """
     If a bond length is 30% shorter or longer than the sum of the atomic radii, the score is lower.
     """
-    structure = Structure.from_str(cif_str, fmt="cif")
+    structure = _parse_structure(cif_str)
+    return _bond_length_reasonableness_score(structure, tolerance, h_factor)
+
+
+def _bond_length_reasonableness_score(structure, tolerance=0.32, h_factor=2.5):
     crystal_nn = CrystalNN()
 
     min_ratio = 1 - tolerance
@@ -68,10 +91,12 @@ def bond_length_reasonableness_score(cif_str, tolerance=0.32, h_factor=2.5):
 
 
 def is_space_group_consistent(cif_str):
-    structure = Structure.from_str(cif_str, fmt="cif")
-    parser = CifParser.from_string(cif_str)
-    cif_data = parser.as_dict()
+    structure = _parse_structure(cif_str)
+    cif_data = _parse_cif_data(cif_str)
+    return _is_space_group_consistent(structure, cif_data)
+
 
+def _is_space_group_consistent(structure, cif_data):
     # Extract the stated space group from the CIF file
     stated_space_group = cif_data[list(cif_data.keys())[0]]['_symmetry_space_group_name_H-M']
 
@@ -88,9 +113,11 @@ def is_space_group_consistent(cif_str):
 
 
 def is_formula_consistent(cif_str):
-    parser = CifParser.from_string(cif_str)
-    cif_data = parser.as_dict()
+    cif_data = _parse_cif_data(cif_str)
+    return _is_formula_consistent(cif_str, cif_data)
 
+
+def _is_formula_consistent(cif_str, cif_data):
     formula_data = Composition(extract_data_formula(cif_str))
     formula_sum = Composition(cif_data[list(cif_data.keys())[0]]["_chemical_formula_sum"])
     formula_structural = Composition(cif_data[list(cif_data.keys())[0]]["_chemical_formula_structural"])
@@ -100,9 +127,11 @@ def is_formula_consistent(cif_str):
 
 def is_atom_site_multiplicity_consistent(cif_str):
     # Parse the CIF string
-    parser = CifParser.from_string(cif_str)
-    cif_data = parser.as_dict()
+    cif_data = _parse_cif_data(cif_str)
+    return _is_atom_site_multiplicity_consistent(cif_data)
+
 
+def _is_atom_site_multiplicity_consistent(cif_data):
     # Extract the chemical formula sum from the CIF data
     formula_sum = cif_data[list(cif_data.keys())[0]]["_chemical_formula_sum"]
 
@@ -144,14 +173,17 @@ def is_sensible(cif_str, length_lo=0.5, length_hi=1000., angle_lo=10., angle_hi=
 
 
 def is_valid(cif_str, bond_length_acceptability_cutoff=1.0):
-    if not is_formula_consistent(cif_str):
+    # parse the CIF only once, and share the parsed data among the checks
+    cif_data = _parse_cif_data(cif_str)
+    if not _is_formula_consistent(cif_str, cif_data):
         return False
-    if not is_atom_site_multiplicity_consistent(cif_str):
+    if not _is_atom_site_multiplicity_consistent(cif_data):
         return False
-    bond_length_score = bond_length_reasonableness_score(cif_str)
+    structure = _parse_structure(cif_str)
+    bond_length_score = _bond_length_reasonableness_score(structure)
     if bond_length_score < bond_length_acceptability_cutoff:
         return False
-    if not is_space_group_consistent(cif_str):
+    if not _is_space_group_consistent(structure, cif_data):
         return False
     return True
 
@@ -1,5 +1,6 @@
 import math
 import re
+from functools import lru_cache
 import pandas as pd
 
 from pymatgen.core import Composition
@@ -83,6 +84,18 @@ def get_atomic_props_block(composition, oxi=False):
 
 
 def replace_symmetry_operators(cif_str, space_group_symbol):
+    symm_block = _get_symmetry_operators_block(space_group_symbol)
+
+    pattern = r"(loop_\n_symmetry_equiv_pos_site_id\n_symmetry_equiv_pos_as_xyz\n1 'x, y, z')"
+    cif_str_updated = re.sub(pattern, symm_block, cif_str)
+
+    return cif_str_updated
+
+
+# generating the symmetry operators of a space group is costly, and the same
+#  space groups are encountered over and over, so the block is built once per symbol
+@lru_cache(maxsize=None)
+def _get_symmetry_operators_block(space_group_symbol):
     space_group = SpaceGroup(space_group_symbol)
     symmetry_ops = space_group.symmetry_ops
 
@@ -99,12 +112,7 @@ def replace_symmetry_operators(cif_str, space_group_symbol):
 
     loops.append(["_symmetry_equiv_pos_site_id", "_symmetry_equiv_pos_as_xyz"])
 
-    symm_block = str(CifBlock(data, loops, "")).replace("data_\n", "")
-
-    pattern = r"(loop_\n_symmetry_equiv_pos_site_id\n_symmetry_equiv_pos_as_xyz\n1 'x, y, z')"
-    cif_str_updated = re.sub(pattern, symm_block, cif_str)
-
-    return cif_str_updated
+    return str(CifBlock(data, loops, "")).replace("data_\n", "")
 
 
 def extract_space_group_symbol(cif_str):
@@ -0,0 +1,38 @@
+import unittest
+
+from crystallm._mcts import MCTSNode
+
+
+class FakeLanguageModel:
+
+    def __init__(self, child_ids, weights):
+        self._child_ids = child_ids
+        self._weights = weights
+
+    def top_n_vocab_with_weights(self, width, state):
+        return self._child_ids[:width], self._weights[:width]
+
+
+class TestMCTSNode(unittest.TestCase):
+
+    def test_add_child_removes_the_selected_move(self):
+        lm = FakeLanguageModel([7, 7, 8], [0.4, 0.4, 0.2])
+        node = MCTSNode([1], lm, width=3, max_depth=2, newline_id=0)
+        first, second, third = node.untried_moves
+        self.assertEqual(first, second)
+
+        node.add_child(second, lm, 3, 2, 0)
+
+        self.assertEqual(2, len(node.untried_moves))
+        self.assertIs(first, node.untried_moves[0])
+        self.assertIs(third, node.untried_moves[1])
+
+    def test_add_child_accepts_an_equal_copy(self):
+        lm = FakeLanguageModel([7, 8], [0.6, 0.4])
+        node = MCTSNode([1], lm, width=2, max_depth=2, newline_id=0)
+
+        child = node.add_child([1, 8], lm, 2, 2, 0)
+
+        self.assertEqual([[1, 7]], node.untried_moves)
+        self.assertEqual([child], node.children)
+        self.assertEqual(0.4, child.prob)
@@ -0,0 +1,42 @@
+import unittest
+import warnings
+
+from pymatgen.core import Lattice, Structure
+from pymatgen.io.cif import CifWriter
+
+from crystallm import (
+    bond_length_reasonableness_score,
+    is_atom_site_multiplicity_consistent,
+    is_formula_consistent,
+    is_space_group_consistent,
+    is_valid,
+)
+
+warnings.filterwarnings("ignore")
+
+
+class TestMetrics(unittest.TestCase):
+
+    def _get_cifs(self):
+        structures = [
+            Structure(Lattice.cubic(4.12), ["Cs", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]),
+            Structure(Lattice.cubic(3.91), ["Sr", "Ti", "O", "O", "O"],
+                      [[0, 0, 0], [0.5, 0.5, 0.5], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]]),
+            Structure(Lattice.cubic(1.5), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]),
+        ]
+        return [str(CifWriter(struct, symprec=0.1)) for struct in structures]
+
+    def test_is_valid_agrees_with_individual_checks(self):
+        for cif_str in self._get_cifs():
+            expected = is_formula_consistent(cif_str) and \
+                is_atom_site_multiplicity_consistent(cif_str) and \
+                bond_length_reasonableness_score(cif_str) >= 1.0 and \
+                is_space_group_consistent(cif_str)
+
+            self.assertEqual(expected, is_valid(cif_str))
+
+    def test_is_valid_formula_inconsistent(self):
+        cif_str = self._get_cifs()[0].replace("data_CsCl", "data_Cs2Cl")
+
+        self.assertFalse(is_formula_consistent(cif_str))
+        self.assertFalse(is_valid(cif_str))